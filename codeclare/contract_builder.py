@@ -1,88 +1,101 @@
-from typing import Dict, Any, List, Tuple, Set
+from typing import Dict, Any, List, Optional, Tuple, FrozenSet
+from functools import lru_cache
 from .ltlf_generator import LTLfGenerator
-from .semantics import simple_trace_semantics, strict_alternation
+from .semantics import simple_trace_semantics, strict_alternation, binary_aux_vars
 import re
 
+#Operator keywords and the identifier pattern used to pull atoms out of formulas
+_OPS = frozenset({"G", "F", "X", "U", "W", "R", "true", "false", "&&", "||", "->", "<->", "!", "(", ")"})
+_ATOM_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
 def _conj(parts: List[str]) -> str:
     #Join multiple formulas with logical AND (&&)
-    parts = [p for p in parts if p and p.strip()]
-    if not parts:
+    #(callers pass already-stripped formulas, so only empty ones are dropped)
+    filtered = [p for p in parts if p]
+    n = len(filtered)
+    if n == 0:
         return "true"
-    return "(" + ") && (".join(parts) + ")"
+    if n == 1:
+        return filtered[0]
+    return "(" + ") && (".join(filtered) + ")"
 
 #Small helper to extract atomic propositions from formulas
-_OPS = {"G", "F", "X", "U", "W", "R", "true", "false", "&&", "||", "->", "<->", "!", "(", ")"}
-def _atoms_in(formula: str) -> Set[str]:
+@lru_cache(maxsize=4096)
+def _atoms_in(formula: str) -> FrozenSet[str]:
     #Return all atomic propositions appearing in an LTLf formula
-    toks = re.findall(r"[A-Za-z_][A-Za-z0-9_]*", formula)
-    return {t for t in toks if t not in _OPS}
+    #(frozen, since the result is shared between cached calls)
+    return frozenset(t for t in _ATOM_RE.findall(formula) if t not in _OPS)
 
 
-def _auto_reclassify(A_gen, G_gen, env, sys):
+def _auto_reclassify(A_gen: List[Dict[str, Any]], G_gen: List[Dict[str, Any]],
+                     env: List[str], sys: List[str]
+                     ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
     #Automatically determine which constraints belong to ASSUMPTIONS vs GUARANTEES.
     #This ensures correct assume–guarantee partitioning even if input JSON is rough.
     
-    env_set, sys_set = set(env), set(sys)
+    env_fs, sys_fs = frozenset(env), frozenset(sys)
 
-    def classify(c):
+    def classify(c: Dict[str, Any]) -> str:
         aps = _atoms_in(c["ltlf"])
-        has_env = any(a in env_set for a in aps)
-        has_sys = any(a in sys_set for a in aps)
+        has_env = not aps.isdisjoint(env_fs)
+        has_sys = not aps.isdisjoint(sys_fs)
 
         # Only environment variables → assumption
         if has_env and not has_sys:
             return "A"
-        # Only system variables → guarantee
-        if has_sys and not has_env:
-            return "G"
-
-        # Mixed → check if template direction implies env→sys
-        name = c.get("template", "").lower()
-        directed_to_sys = {
-            "response", "chain_response", "alternate_response",
-            "precedence", "chain_precedence", "alternate_precedence",
-            "succession", "weak_link"
-        }
-        return "G" if name in directed_to_sys else "G"
-
-    # Apply classification
-    newA, newG = [], []
+        # Only system variables or mixed (env→sys directed) → guarantee
+        return "G"
+
+    # Apply classification (identical constraints are only classified once)
+    seen: Dict[str, str] = {}
+    newA: List[Dict[str, Any]] = []
+    newG: List[Dict[str, Any]] = []
     for c in A_gen + G_gen:
-        side = classify(c)
+        key = c["ltlf"]
+        side = seen.get(key)
+        if side is None:
+            side = seen[key] = classify(c)
         (newA if side == "A" else newG).append(c)
     return newA, newG
 
 
-def build_contract(spec: Dict[str, Any]) -> Dict[str, Any]:
+def build_contract(spec: Dict[str, Any], encoding: Optional[str] = None) -> Dict[str, Any]:
     # Build a full assume–guarantee LTLf contract from a coDECLARE model:
     # Generates LTLf formulas from templates
     # Reclassifies constraints as assumptions/guarantees
     # Adds trace semantics + strict alternation constraints
+    # (encoding selects the 'exactly one' encoding, see simple_trace_semantics)
     
     env = spec.get("environment", [])
     sys = spec.get("system", [])
 
     # Generate raw formulas from templates
-    A_gen = LTLfGenerator(spec["assumptions"]).generate()
-    G_gen = LTLfGenerator(spec["guarantees"]).generate()
+    A_gen = LTLfGenerator(spec["assumptions"], parse_obj=False).generate()
+    G_gen = LTLfGenerator(spec["guarantees"], parse_obj=False).generate()
 
     # Automatically fix misclassified constraints
     A_gen, G_gen = _auto_reclassify(A_gen, G_gen, env, sys)
 
-    # Build conjunctions for each side
-    A_text = _conj([x["ltlf"] for x in A_gen])
-    G_text = _conj([x["ltlf"] for x in G_gen])
+    # Binary encoding adds auxiliary bits: env bits are inputs, sys bits outputs
+    env_aux, sys_aux = [], []
+    if encoding == "binary":
+        env_aux = binary_aux_vars(env, "env_bit")
+        sys_aux = binary_aux_vars(sys, "sys_bit")
+        clash = set(env_aux + sys_aux) & set(env + sys)
+        if clash:
+            raise ValueError(f"Auxiliary variables clash with activities: {', '.join(sorted(clash))}")
 
     # Add formal semantics: simple trace + strict alternation
-    env_sem = simple_trace_semantics(env)
-    sys_sem = simple_trace_semantics(sys)
+    env_sem = simple_trace_semantics(env, encoding, "env_bit")
+    sys_sem = simple_trace_semantics(sys, encoding, "sys_bit")
     alt = strict_alternation(env, sys)
 
-    left = _conj([A_text, env_sem, alt])
-    right = _conj([G_text, sys_sem, alt])
+    # Build one flat conjunction per side; the same alt string is shared by both
+    left = _conj([*(x["ltlf"] for x in A_gen), env_sem, alt])
+    right = _conj([*(x["ltlf"] for x in G_gen), sys_sem, alt])
     contract_ltlf = f"({left}) -> ({right})"
 
-    def _clean(constraints):
+    def _clean(constraints: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         cleaned = []
         for c in constraints:
             c2 = dict(c)
@@ -93,8 +106,8 @@ def build_contract(spec: Dict[str, Any]) -> Dict[str, Any]:
     return {
         "assumptions_list": _clean(A_gen),
         "guarantees_list": _clean(G_gen),
-        "env_semantics": {"simple_trace": env_sem},
-        "sys_semantics": {"simple_trace": sys_sem},
+        "env_semantics": {"simple_trace": env_sem, "aux": env_aux},
+        "sys_semantics": {"simple_trace": sys_sem, "aux": sys_aux},
         "alternation": alt,
         "contract_ltlf": contract_ltlf,
         "environment": env,
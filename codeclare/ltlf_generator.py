@@ -1,4 +1,4 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Set, Tuple
 from Declare4Py.ProcessModels.LTLModel import LTLTemplate
 
 # Try different parser imports depending on pylogics version
@@ -21,43 +21,48 @@ def _clean(formula_str: str) -> str:
     return formula_str.replace("con_", "")
 
 
+# Manual (non-Declare4Py) templates: name -> (number of activities, formula builder)
+_MANUAL_HANDLERS: Dict[str, Tuple[int, Callable[..., str]]] = {
+    "absence2": (1, lambda a: f"!F({a} && X(F({a})))"),
+    "neg_succession": (2, lambda a, b: f"G({a} -> !F({b}))"),
+    "not_coexistence": (2, lambda a, b: f"!((F({a})) && (F({b})))"),
+    # 'a' must be followed by 'b', and 'b' must not occur before 'a'
+    "succession": (2, lambda a, b: f"G({a} -> F({b})) && (!{b}) U {a}"),
+}
+
+# Supported constraint templates
+_SUPPORTED = frozenset({
+    # Built-in Declare4Py templates
+    "next_a", "eventually_a", "eventually_a_then_b", "eventually_a_or_b",
+    "eventually_a_next_b", "eventually_a_then_b_then_c",
+    "eventually_a_next_b_next_c", "is_first_state_a", "is_second_state_a",
+    "is_third_state_a", "last", "second_last", "third_last",
+    "is_last_state_a", "is_second_last_state_a", "is_third_last_state_a",
+    "precedence", "chain_precedence", "responded_existence",
+    "chain_response", "not_chain_precedence", "not_chain_response",
+    "response", "not_precedence", "not_response",
+    "not_responded_existence", "alternate_response", "alternate_precedence",
+    # Custom manually-defined ones
+    *_MANUAL_HANDLERS,
+})
+
+
 class LTLfGenerator:
-    #Converts declarative constraints into LTLf formulas and their corresponding pylogics object representation.
+    #Converts declarative constraints into LTLf formulas, plus their pylogics object
+    #representation when constructed with parse_obj=True.
 
-    def __init__(self, constraints: List[Dict[str, Any]]):
+    def __init__(self, constraints: List[Dict[str, Any]], parse_obj: bool = False):
         self.constraints = constraints
-        # Supported constraint templates
-        self.supported = {
-            # Built-in Declare4Py templates
-            "next_a", "eventually_a", "eventually_a_then_b", "eventually_a_or_b",
-            "eventually_a_next_b", "eventually_a_then_b_then_c",
-            "eventually_a_next_b_next_c", "is_first_state_a", "is_second_state_a",
-            "is_third_state_a", "last", "second_last", "third_last",
-            "is_last_state_a", "is_second_last_state_a", "is_third_last_state_a",
-            "precedence", "chain_precedence", "responded_existence",
-            "chain_response", "not_chain_precedence", "not_chain_response",
-            "response", "not_precedence", "not_response",
-            "not_responded_existence", "alternate_response", "alternate_precedence",
-            # Custom manually-defined ones
-            "absence2", "neg_succession", "not_coexistence", "succession"
-        }
+        # Only build the pylogics object when the caller actually needs it
+        self.parse_obj = parse_obj
+        self.supported = _SUPPORTED
 
     # Handle manual (non-Declare4Py) templates
     def _manual(self, name: str, acts: List[str]) -> str:
-        if name == "absence2":
-            a, = acts
-            return f"!F({a} && X(F({a})))"
-        if name == "neg_succession":
-            a, b = acts
-            return f"G({a} -> !F({b}))"
-        if name == "not_coexistence":
-            a, b = acts
-            return f"!((F({a})) && (F({b})))"
-        if name == "succession":
-            a, b = acts
-            # 'a' must be followed by 'b', and 'b' must not occur before 'a'
-            return f"G({a} -> F({b})) && (!{b}) U {a}"
-        raise KeyError(name)
+        arity, build = _MANUAL_HANDLERS[name]
+        if len(acts) != arity:
+            raise ValueError(f"Template '{name}' expects {arity} activities, got {len(acts)}")
+        return build(*acts)
 
     # Handle normal Declare4Py templates
     def _declare4py(self, template_name: str, acts: List[str]) -> str:
@@ -81,8 +86,10 @@ class LTLfGenerator:
         return _clean(model.formula)
 
     def generate(self) -> List[Dict[str, Any]]:
-        # Generates list of constraints with both string and object forms
-        results = []
+        # Generates list of constraints with their string form; the object form
+        # ("obj") is only built when parse_obj=True, otherwise it is None
+        results: List[Dict[str, Any]] = []
+        seen: Set[Tuple[str, Tuple[str, ...]]] = set()
         for c in self.constraints:
             name = c["template"].lower()
             acts = c["activities"]
@@ -90,16 +97,22 @@ class LTLfGenerator:
                 print(f"Skipping unknown template '{name}'")
                 continue
 
+            # Identical (template, activities) pairs yield identical formulas
+            key = (name, tuple(acts))
+            if key in seen:
+                print(f"Skipping duplicate constraint '{name}' ({acts})")
+                continue
+            seen.add(key)
+
             try:
                 # Build formula string using manual or DECLARE template
-                s = self._manual(name, acts) if name in {
-                    "absence2", "neg_succession", "not_coexistence", "succession"
-                } else self._declare4py(name, acts)
+                s = self._manual(name, acts) if name in _MANUAL_HANDLERS \
+                    else self._declare4py(name, acts)
 
-                # Parse LTLf string into a pylogics AST object
-                obj = parse_ltlf(s)
+                # Parse LTLf string into a pylogics AST object (if requested)
+                obj = parse_ltlf(s) if self.parse_obj else None
 
-                # Store both string and object form
+                # Store string and (optional) object form
                 results.append({
                     "template": name,
                     "activities": acts,
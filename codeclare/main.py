@@ -1,18 +1,49 @@
 import argparse
+import hashlib
 import json
 import os
+import shutil
 import subprocess
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 from .parser import load_spec
 from .contract_builder import build_contract
 from .tlsf_exporter import export_tlsf
 from .utils.strategy_utils import dot_to_pdf, display_pdf_in_colab
 
 
-def run_lydia_synthesis(tlsf_path: Path, output_dir: Path) -> Path:
+# Known install locations (Colab / Docker image), in order of preference
+_LYDIASYFT_PATHS = [
+    "/content/LydiaSyftPlus/build/bin/LydiaSyft",
+    "/content/LydiaSyftPlus/build/bin/LydiaSyftEL",
+    "/LydiaSyft/build/bin/LydiaSyft",
+    "/LydiaSyft/build/bin/LydiaSyftEL",
+]
+
+
+@lru_cache(maxsize=1)
+def _detect_backend() -> Optional[str]:
+    """Return the first LydiaSyft binary found; probed once per process.
+    A miss is not kept cached (see run_lydia_synthesis), so a binary built
+    later in the same session, e.g. in Colab, is still picked up."""
+    return next((p for p in _LYDIASYFT_PATHS if Path(p).exists()), None)
+
+
+def _synthesis_cache_path(tlsf_path: Path, output_dir: Path, lydiasyft_bin: str) -> Path:
+    """Location of the cached strategy for this TLSF content and binary."""
+    h = hashlib.sha256(tlsf_path.read_bytes())
+    bin_path = Path(shutil.which(lydiasyft_bin) or lydiasyft_bin)
+    h.update(f"{bin_path}:{bin_path.stat().st_mtime_ns}".encode())
+    return output_dir / ".synthesis_cache" / f"{h.hexdigest()}.dot"
+
+
+def run_lydia_synthesis(tlsf_path: Path, output_dir: Path,
+                        backend: Optional[str] = None) -> Path:
     """
     Run LydiaSyft (or LydiaSyftEL) depending on which binary exists.
-    Automatically detects the environment (Mac / Colab / Docker).
+    Automatically detects the environment (Mac / Colab / Docker) unless
+    `backend` gives the binary to use explicitly.
     """
     print("\n Running LydiaSyft synthesis...\n")
 
@@ -21,17 +52,20 @@ def run_lydia_synthesis(tlsf_path: Path, output_dir: Path) -> Path:
     strategy_path = out_abs / "strategy.dot"
 
     # Try local or Docker-based execution
-    lydiasyft_paths = [
-        "/content/LydiaSyftPlus/build/bin/LydiaSyft",
-        "/content/LydiaSyftPlus/build/bin/LydiaSyftEL",
-        "/LydiaSyft/build/bin/LydiaSyft",
-        "/LydiaSyft/build/bin/LydiaSyftEL",
-    ]
-    lydiasyft_bin = next((p for p in lydiasyft_paths if Path(p).exists()), None)
+    lydiasyft_bin = backend or _detect_backend()
 
     if not lydiasyft_bin:
+        _detect_backend.cache_clear()
         raise FileNotFoundError(" No LydiaSyft or LydiaSyftEL binary found.")
 
+    # Reuse a previous strategy if this exact TLSF was already synthesized
+    # with the same binary (its path and mtime are part of the key)
+    cache_path = _synthesis_cache_path(tlsf_abs, out_abs, lydiasyft_bin)
+    if cache_path.exists():
+        shutil.copyfile(cache_path, strategy_path)
+        print(f" Reused cached strategy {cache_path.name} → {strategy_path}")
+        return strategy_path
+
     # --- Construct the appropriate command ---
     if lydiasyft_bin.endswith("LydiaSyft"):
         cmd = [lydiasyft_bin, "synthesis", "-f", str(tlsf_abs)]
@@ -49,6 +83,12 @@ def run_lydia_synthesis(tlsf_path: Path, output_dir: Path) -> Path:
 
     print(f"▶️ Running: {' '.join(cmd)}\n")
 
+    # Remove strategies left by earlier runs, so only one produced now is
+    # copied to outputs and cached (an unrealizable spec writes none)
+    strategy_dot = Path("strategy.dot")
+    strategy_dot.unlink(missing_ok=True)
+    strategy_path.unlink(missing_ok=True)
+
     try:
         result = subprocess.run(cmd, check=True, capture_output=True, text=True)
         print(result.stdout)
@@ -59,10 +99,11 @@ def run_lydia_synthesis(tlsf_path: Path, output_dir: Path) -> Path:
         raise
 
     # If strategy.dot was generated, copy to outputs
-    strategy_dot = Path("strategy.dot")
     if strategy_dot.exists():
-        subprocess.run(["cp", str(strategy_dot), str(strategy_path)], check=False)
+        shutil.copyfile(strategy_dot, strategy_path)
         print(f" Copied strategy.dot → {strategy_path}")
+        cache_path.parent.mkdir(exist_ok=True)
+        shutil.copyfile(strategy_path, cache_path)
     else:
         print(" No strategy.dot file found (possibly unrealizable).")
 
@@ -72,6 +113,8 @@ def run_lydia_synthesis(tlsf_path: Path, output_dir: Path) -> Path:
 def main():
     ap = argparse.ArgumentParser(description="coDECLARE → LTLf → TLSF → LydiaSyft")
     ap.add_argument("--in", dest="input_path", required=True, help="Input coDECLARE JSON file")
+    ap.add_argument("--encoding", choices=["pairwise", "binary"], default=None,
+                    help="Encoding of the 'exactly one' trace semantics (default: automatic)")
     args = ap.parse_args()
 
     input_path = Path(args.input_path)
@@ -83,7 +126,7 @@ def main():
 
     # Step 1: Build assume–guarantee contract
     print("Building assume–guarantee LTLf contract...")
-    result = build_contract(spec)
+    result = build_contract(spec, encoding=args.encoding)
 
     outputs_dir = Path("outputs")
     outputs_dir.mkdir(exist_ok=True)
@@ -1,5 +1,14 @@
 import json
+import sys
 from pathlib import Path
+from typing import List
+
+
+def _normalize_names(names: List[str]) -> None:
+    #Strip and intern activity names in place (they're short identifiers)
+    for i, a in enumerate(names):
+        names[i] = sys.intern(a.strip())
+
 
 def load_spec(path: str):
     """
@@ -18,15 +27,15 @@ def load_spec(path: str):
             raise ValueError(f"Missing key '{k}' in {path}")
 
     # Clean up and normalize activity names
-    data["environment"] = [a.strip() for a in data["environment"]]
-    data["system"] = [a.strip() for a in data["system"]]
+    _normalize_names(data["environment"])
+    _normalize_names(data["system"])
 
     # Normalize constraint definitions
     for section in ("assumptions", "guarantees"):
         for c in data[section]:
             # normalize names like “Responded Existence” → “responded_existence”
             c["template"] = c["template"].strip().lower().replace(" ", "_")
-            c["activities"] = [a.strip() for a in c["activities"]]
+            _normalize_names(c["activities"])
 
     # Ensure environment and system variables don’t overlap
     overlap = set(data["environment"]) & set(data["system"])
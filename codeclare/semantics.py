@@ -1,19 +1,73 @@
-from typing import List
+from typing import List, Optional, Sequence, Tuple
+from functools import lru_cache
 
-def _exactly_one(props: List[str]) -> str:
+def _exactly_one(props: Sequence[str]) -> str:
     #Return an LTLf formula that enforces 'exactly one' proposition is true.
     if not props:
         return "true"
     # Build OR of mutually exclusive propositions
+    negs_all = [f"!{q}" for q in props]
     terms = []
     for i, p in enumerate(props):
-        negs = [f"!{q}" for j, q in enumerate(props) if j != i]
+        negs = negs_all[:i] + negs_all[i + 1:]
         terms.append("(" + p + (" && " + " && ".join(negs) if negs else "") + ")")
     return "(" + " || ".join(terms) + ")"
 
 
-def simple_trace_semantics(props: List[str]) -> str:
-    #Each trace position has exactly one active proposition from the set
+def _exactly_one_pairwise(props: Sequence[str]) -> str:
+    #Same as _exactly_one, but as pairwise mutual exclusion plus an at-least-one clause.
+    if not props:
+        return "true"
+    at_least_one = "(" + " || ".join(props) + ")"
+    mutex = [f"!({p} && {q})" for i, p in enumerate(props) for q in props[i + 1:]]
+    return "(" + " && ".join([at_least_one, *mutex]) + ")"
+
+
+def binary_aux_vars(props: Sequence[str], aux_prefix: str) -> List[str]:
+    #Auxiliary bit variables needed to log-encode 'exactly one' over props
+    if len(props) <= 1:
+        return []
+    return [f"{aux_prefix}{j}" for j in range((len(props) - 1).bit_length())]
+
+
+def _exactly_one_log(props: Sequence[str], aux_prefix: str) -> str:
+    #Same as _exactly_one, but O(n log n): each prop is tied to its own bit
+    #pattern over ceil(log2(n)) aux variables, and unused patterns are forbidden.
+    if len(props) <= 1:
+        return _exactly_one(props)
+    bits = binary_aux_vars(props, aux_prefix)
+
+    def pattern(i: int) -> str:
+        return " && ".join(b if (i >> j) & 1 else f"!{b}" for j, b in enumerate(bits))
+
+    # '<->' is written as two implications, TLSF export would split the operator
+    terms = [f"({p} -> ({pattern(i)})) && (({pattern(i)}) -> {p})" for i, p in enumerate(props)]
+    terms += [f"!({pattern(i)})" for i in range(len(props), 1 << len(bits))]
+    return "(" + " && ".join(terms) + ")"
+
+
+# Above this alphabet size the pairwise encoding is emitted by default
+_PAIRWISE_THRESHOLD = 8
+
+
+def simple_trace_semantics(props: List[str], encoding: Optional[str] = None,
+                           aux_prefix: str = "bit") -> str:
+    #Each trace position has exactly one active proposition from the set.
+    #encoding: None (direct, or pairwise above 8 props), "pairwise" or "binary";
+    #"binary" introduces the binary_aux_vars(props, aux_prefix) variables.
+    return _simple_trace_semantics(tuple(props), encoding, aux_prefix)
+
+
+@lru_cache(maxsize=None)
+def _simple_trace_semantics(props: Tuple[str, ...], encoding: Optional[str],
+                            aux_prefix: str) -> str:
+    #Cached body of simple_trace_semantics (lists aren't hashable, so keyed by tuple)
+    if encoding == "binary":
+        return f"G({_exactly_one_log(props, aux_prefix)})"
+    if encoding == "pairwise" or (encoding is None and len(props) > _PAIRWISE_THRESHOLD):
+        return f"G({_exactly_one_pairwise(props)})"
+    if encoding is not None:
+        raise ValueError(f"Unknown trace encoding '{encoding}'")
     return f"G({_exactly_one(props)})"
 
 
@@ -21,7 +75,12 @@ def strict_alternation(env: List[str], sys: List[str]) -> str:
     # Model strict alternation between environment and system:
     #Environment acts, then system responds.
     # Each step alternates deterministically.
-    
+    return _strict_alternation(tuple(env), tuple(sys))
+
+
+@lru_cache(maxsize=None)
+def _strict_alternation(env: Tuple[str, ...], sys: Tuple[str, ...]) -> str:
+    #Cached body of strict_alternation
     env_any = "(" + " || ".join(env) + ")" if env else "false"
     sys_any = "(" + " || ".join(sys) + ")" if sys else "false"
     return f"G(({env_any}) -> X({sys_any})) && G(({sys_any}) -> X({env_any}))"
\ No newline at end of file
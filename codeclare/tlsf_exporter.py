@@ -1,13 +1,18 @@
-from pathlib import Path
 from typing import Dict, Any
+from functools import lru_cache
 import re
 
+#Whitespace runs and bare 'U' (until) operators, compiled once
+_WS_RE = re.compile(r'\s+')
+_U_RE = re.compile(r'(?<! )U(?![A-Za-z])')
+
+@lru_cache(maxsize=1024)
 def _sanitize_formula(f: str) -> str:
     # Clean and normalize an LTLf formula for TLSF syntax (spaces, parentheses)
     f = f.strip().rstrip(";")
-    f = re.sub(r'\s+', ' ', f)
+    f = _WS_RE.sub(' ', f)
     f = f.replace("&&", " && ").replace("||", " || ").replace("->", " -> ")
-    f = re.sub(r'(?<! )U(?![A-Za-z])', ' U ', f)
+    f = _U_RE.sub(' U ', f)
     opens, closes = f.count("("), f.count(")")
     if opens > closes:
         f += ")" * (opens - closes)
@@ -21,8 +26,9 @@ def export_tlsf(result: Dict[str, Any], out_path: str,
     # Export the LTLf assume–guarantee contract into TLSF format,
     # so that it can be checked/synthesized using LydiaSyft.
     
-    env = result.get("environment", [])
-    sys = result.get("system", [])
+    # Auxiliary encoding bits (if any) are declared alongside the activities
+    env = [*result.get("environment", []), *result.get("env_semantics", {}).get("aux", [])]
+    sys = [*result.get("system", []), *result.get("sys_semantics", {}).get("aux", [])]
 
     assumptions = [x["ltlf"] for x in result.get("assumptions_list", [])]
     guarantees = [x["ltlf"] for x in result.get("guarantees_list", [])]
@@ -35,12 +41,20 @@ def export_tlsf(result: Dict[str, Any], out_path: str,
     assumptions_full = [*assumptions, env_sem, alt]
     guarantees_full = [*guarantees, sys_sem, alt]
 
-    def _block(lines: list[str]) -> str:
-        #print a list of formulas as TLSF block content.
-        cleaned = [_sanitize_formula(f) + ";" for f in lines if f.strip()]
-        return "\n  ".join(cleaned) if cleaned else "true;"
+    def _write_block(fh, lines: list[str]) -> None:
+        #write a list of formulas as TLSF block content.
+        sep = ""
+        for f in lines:
+            if f.strip():
+                fh.write(sep)
+                fh.write(_sanitize_formula(f))
+                fh.write(";")
+                sep = "\n  "
+        if not sep:
+            fh.write("true;")
 
-    text = f"""INFO {{
+    with open(out_path, "w") as fh:
+        fh.write(f"""INFO {{
   TITLE:       "{title}"
   DESCRIPTION: "{description}"
   SEMANTICS:   Finite,Mealy
@@ -58,13 +72,16 @@ MAIN {{
   }}
 
   ASSUMPTIONS {{
-    {_block(assumptions_full)}
-  }}
+    """)
+        _write_block(fh, assumptions_full)
+        fh.write("""
+  }
 
-  GUARANTEES {{
-    {_block(guarantees_full)}
-  }}
+  GUARANTEES {
+    """)
+        _write_block(fh, guarantees_full)
+        fh.write("""
+  }
 
-}}
-"""
-    Path(out_path).write_text(text)
\ No newline at end of file
+}
+""")